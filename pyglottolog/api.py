@@ -4,7 +4,7 @@ import re
 import os
 from collections import OrderedDict
 
-from clldutils.path import Path, as_posix, walk, git_describe
+from clldutils.path import Path, as_posix, git_describe
 from clldutils.misc import UnicodeMixin, cached_property
 from clldutils.declenum import EnumSymbol
 import pycountry
@@ -27,6 +27,7 @@ class Glottolog(UnicodeMixin):
     def __init__(self, repos=None):
         self.repos = (Path(repos) if repos else Path(__file__).parent.parent).resolve()
         self.tree = self.repos.joinpath('languoids', 'tree')
+        self._dirs_by_glottocode = None
 
     def __unicode__(self):
         return '<Glottolog repos {0} at {1}>'.format(git_describe(self.repos), self.repos)
@@ -47,7 +48,7 @@ class Glottolog(UnicodeMixin):
     def iso(self):
         return util.get_iso(self.build_path())
 
-    @property
+    @cached_property()
     def glottocodes(self):
         return objects.Glottocodes(self.languoids_path('glottocodes.json'))
 
@@ -60,28 +61,36 @@ class Glottolog(UnicodeMixin):
             return id_
 
         if ISO_CODE_PATTERN.match(id_):
-            for d in walk(self.tree, mode='dirs'):
-                l = languoids.Languoid.from_dir(d)
+            for l in self.languoids():
                 if l.iso_code == id_:
                     return l
         else:
-            for d in walk(self.tree, mode='dirs'):
-                if d.name == id_:
-                    return languoids.Languoid.from_dir(d)
+            d = self._languoid_dir(id_)
+            if d:
+                return languoids.Languoid.from_dir(d, tree=self.tree)
 
-    def languoids(self, ids=None, maxlevel=objects.Level.dialect):
-        nodes = {}
+    def _languoid_dir(self, glottocode):
+        """
+        Look up the directory of a languoid in an index of the tree, built on first use.
 
-        for dirpath, dirnames, filenames in os.walk(as_posix(self.tree)):
-            dp = Path(dirpath)
-            if dp.name in nodes and nodes[dp.name][2] > maxlevel:
-                del dirnames[:]
+        Since the tree may change, the index is rebuilt when a lookup fails or returns a
+        directory which does not exist anymore.
+        """
+        rebuilt = False
+        if self._dirs_by_glottocode is None:
+            self._dirs_by_glottocode = {
+                dirname: os.path.join(dirpath, dirname)
+                for dirpath, dirnames, _ in os.walk(as_posix(self.tree))
+                for dirname in dirnames}
+            rebuilt = True
+        d = self._dirs_by_glottocode.get(glottocode)
+        if (d is None or not os.path.isdir(d)) and not rebuilt:
+            self._dirs_by_glottocode = None
+            return self._languoid_dir(glottocode)
+        return Path(d) if d else None
 
-            for dirname in dirnames:
-                if ids is None or dirname in ids:
-                    lang = languoids.Languoid.from_dir(dp.joinpath(dirname), nodes=nodes)
-                    if lang.level <= maxlevel:
-                        yield lang
+    def languoids(self, ids=None, maxlevel=objects.Level.dialect):
+        return languoids.walk_tree(self.tree, ids=ids, maxlevel=maxlevel)
 
     def languoids_by_code(self):
         """
@@ -123,27 +132,33 @@ class Glottolog(UnicodeMixin):
         return references.HHTypes(self)
 
     @cached_property()
-    def triggers(self):
-        res = {'inlg': [], 'lgcode': []}
+    def _triggers_and_macroarea_map(self):
+        # Compiling the monster bib needs both, triggers and the macroarea map, so we
+        # collect them in one walk of the tree.
+        triggers, macroareas = {'inlg': [], 'lgcode': []}, {}
         for lang in self.languoids():
-            for type_ in res:
+            hid, iso = lang.hid, lang.iso
+            for type_ in triggers:
                 if lang.cfg.has_option('triggers', type_):
-                    label = '%s [%s]' % (lang.name, lang.hid or lang.id)
-                    res[type_].extend([util.Trigger(type_, label, text)
-                                       for text in lang.cfg.getlist('triggers', type_)])
-        return res
+                    label = '%s [%s]' % (lang.name, hid or lang.id)
+                    triggers[type_].extend([util.Trigger(type_, label, text)
+                                            for text in lang.cfg.getlist('triggers', type_)])
+            mas = lang.macroareas
+            ma = mas[0].value if mas else ''
+            macroareas[lang.id] = ma
+            if iso:
+                macroareas[iso] = ma
+            if hid:
+                macroareas[hid] = ma
+        return triggers, macroareas
 
-    @cached_property()
+    @property
+    def triggers(self):
+        return self._triggers_and_macroarea_map[0]
+
+    @property
     def macroarea_map(self):
-        res = {}
-        for lang in self.languoids():
-            ma = lang.macroareas[0].value if lang.macroareas else ''
-            res[lang.id] = ma
-            if lang.iso:
-                res[lang.iso] = ma
-            if lang.hid:
-                res[lang.hid] = ma
-        return res
+        return self._triggers_and_macroarea_map[1]
 
 
 def _ascii_node(n, level, last, maxlevel, prefix):
@@ -13,10 +13,10 @@ from termcolor import colored
 from clldutils.clilib import command, ParserError
 from clldutils.misc import slug
 from clldutils.markup import Table
-from clldutils.path import Path, write_text, read_text, git_describe
+from clldutils.path import Path, as_posix, write_text, read_text, git_describe
 
 import pyglottolog
-from pyglottolog.languoids import Languoid
+from pyglottolog.languoids import Languoid, INFO_FILENAME
 from pyglottolog.objects import Level, Reference
 from pyglottolog import fts
 from pyglottolog import lff
@@ -276,33 +276,44 @@ def index(args):
 
     glottolog index (family|language|dialect|all)
     """
+    def write(repos, fname, text):
+        # We only write files whose content changed, to not needlessly touch files which
+        # are under version control.
+        p = repos.languoids_path(fname)
+        if not p.exists() or read_text(p) != text:
+            write_text(p, text)
+
     def make_index(level, languoids, repos):
         fname = dict(
             language='languages', family='families', dialect='dialects')[level.name]
-        links = defaultdict(dict)
+        base = as_posix(repos.languoids_path())
+        links = defaultdict(list)
         for lang in languoids:
-            label = '{0.name} [{0.id}]'.format(lang)
+            name = lang.name
+            label = '%s [%s]' % (name, lang.id)
             if lang.iso:
                 label += '[%s]' % lang.iso
-            links[slug(lang.name)[0]][label] = \
-                lang.fname.relative_to(repos.languoids_path())
+            links[slug(name)[0]].append((
+                label,
+                os.path.relpath(os.path.join(as_posix(lang.dir), INFO_FILENAME), base)))
 
-        with repos.languoids_path(fname + '.md').open('w', encoding='utf8') as fp:
-            fp.write('## %s\n\n' % fname.capitalize())
-            fp.write(' '.join(
-                '[-%s-](%s_%s.md)' % (i.upper(), fname, i) for i in sorted(links.keys())))
-            fp.write('\n')
+        write(repos, fname + '.md', '## %s\n\n%s\n' % (
+            fname.capitalize(),
+            ' '.join(
+                '[-%s-](%s_%s.md)' % (i.upper(), fname, i) for i in sorted(links.keys()))))
 
         for i, langs in links.items():
-            with repos.languoids_path(
-                    '%s_%s.md' % (fname, i)).open('w', encoding='utf8') as fp:
-                for label in sorted(langs.keys()):
-                    fp.write('- [%s](%s)\n' % (label, langs[label]))
+            write(
+                repos,
+                '%s_%s.md' % (fname, i),
+                ''.join(['- [%s](%s)\n' % link for link in sorted(langs)]))
 
-    langs = list(args.repos.languoids())
+    langs_by_level = defaultdict(list)
+    for lang in args.repos.languoids():
+        langs_by_level[lang.level].append(lang)
     for level in Level:
         if not args.args or args.args[0] == level.name:
-            make_index(level, [l for l in langs if l.level == level], args.repos)
+            make_index(level, langs_by_level[level], args.repos)
 
 
 @command()
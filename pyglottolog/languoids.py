@@ -1,10 +1,19 @@
 # coding: utf8
 from __future__ import unicode_literals
+import io
 import os
+import sys
 from collections import defaultdict
 
+if sys.version_info < (3, 6):  # pragma: no cover
+    # Iterators returned by os.scandir can only be closed explicitly as of Python 3.6.
+    from scandir import scandir
+else:
+    from os import scandir
+
+from six import string_types
 from clldutils.misc import UnicodeMixin
-from clldutils.path import Path
+from clldutils.path import Path, as_posix
 from clldutils.inifile import INI
 from newick import Node
 
@@ -15,6 +24,218 @@ from pyglottolog.objects import (
 
 INFO_FILENAME = 'md.ini'
 
+# Checking directory names for Glottocodes happens in tight loops. Calling the bound match
+# method of the compiled pattern directly turned out to be faster than hand-written
+# character class checks.
+_is_glottocode = Glottocode.pattern.match
+
+# Process-wide cache, so that each INI file in the tree is read from disk at most once:
+# Maps file paths to pairs ((mtime, size), content).
+_FILE_CACHE = {}
+
+
+def clear_caches():
+    """
+    Discard everything read from the languoid tree so far. Must be called after
+    manipulating the tree on disk, e.g. in `lff2tree`.
+    """
+    _FILE_CACHE.clear()
+
+
+def _cache_key(fname):
+    st = os.stat(fname)
+    return st.st_mtime, st.st_size
+
+
+def _read_text(fname):
+    """
+    Read a text file, returning the cached content if the file did not change since it was
+    last read.
+    """
+    key = _cache_key(fname)
+    cached = _FILE_CACHE.get(fname)
+    if cached and cached[0] == key:
+        return cached[1]
+    # Decoding the bytes ourselves is faster than reading in text mode. Since ConfigParser
+    # strips whitespace from lines, we don't need universal newlines.
+    with io.open(fname, 'rb') as fp:
+        text = fp.read().decode('utf8')
+    _FILE_CACHE[fname] = (key, text)
+    return text
+
+
+def _read_ini(fname):
+    """
+    Read an INI file into a new `INI` object.
+
+    Note: Only the file content is cached - `INI` objects are mutable, so each caller
+    gets its own.
+    """
+    if not isinstance(fname, string_types):
+        fname = as_posix(fname)
+    return _parse_ini(_read_text(fname), fname)
+
+
+def _parse_ini(text, source):
+    # Parsing the whole content at once is a bit faster than letting ConfigParser.read
+    # iterate over the lines of the file.
+    cfg = INI(interpolation=None)
+    cfg.read_string(text, source=source)
+    return cfg
+
+
+# Marker for values in the core section which span multiple lines - and which we leave
+# to ConfigParser to parse.
+_MULTILINE = object()
+
+
+def _read_core(text):
+    """
+    Read the core section of the content of a languoid INI file with a minimal parser,
+    which is a lot faster than ConfigParser, because it only has to deal with simple
+    `key = value` lines.
+
+    :return: `dict` mapping option names to values, with values spanning multiple lines \
+    mapped to `_MULTILINE`, or `None` if the text contains anything the parser does not \
+    understand.
+    """
+    header = '[%s]' % Languoid.section_core
+    if text.count(header) > 1:
+        # A repeated core section would be rejected by ConfigParser - so we leave it to
+        # ConfigParser to report the error.
+        return None
+    res, option = None, None
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped or stripped[0] in '#;':
+            continue
+        if line[0] in ' \t':
+            # A continuation line.
+            if res is not None:
+                if option is None:
+                    return None
+                res[option] = _MULTILINE
+            continue
+        if stripped[0] == '[':
+            if res is not None:
+                # We are past the core section.
+                break
+            if not stripped.endswith(']') or stripped == '[DEFAULT]':
+                return None
+            if stripped == header:
+                res = {}
+            continue
+        if res is not None:
+            # Like ConfigParser, we split option lines at the first delimiter.
+            delimiters = [i for i in (stripped.find('='), stripped.find(':')) if i >= 0]
+            if not delimiters:
+                return None
+            i = min(delimiters)
+            option = stripped[:i].rstrip().lower()
+            if option in res:
+                return None
+            res[option] = stripped[i + 1:].strip()
+    return res
+
+
+def _read_languoid_data(fname):
+    """
+    Read the data of a languoid for read-only access.
+
+    :return: Triple (cfg, core, text) to be passed into `Languoid`, with either the `INI` \
+    object, if the file cannot be read with `_read_core`, or the core section as read with \
+    `_read_core` and the file content to create the `INI` object from when needed.
+    """
+    text = _read_text(fname)
+    core = _read_core(text)
+    if core is None:
+        return _parse_ini(text, fname), None, None
+    return None, core, text
+
+
+def walk_tree(tree, ids=None, maxlevel=Level.dialect):
+    """
+    Generator for the languoids in a languoid tree, yielding each languoid before its
+    descendants.
+
+    Only the core section of INI files is read during the walk. Thus, errors in other
+    sections are only detected when the full data of a languoid is accessed.
+
+    :param tree: Root directory of the tree.
+    :param ids: Optional collection of Glottocodes to restrict the result to.
+    :param maxlevel: `Level` of the most fine-grained languoids to include.
+    """
+    tree = as_posix(tree)
+    if not os.path.isdir(tree):
+        # Like os.walk, we don't complain about a missing tree.
+        return iter([])
+    return _walk_tree(tree, [], ids, maxlevel)
+
+
+def _walk_tree(dirpath, lineage, ids, maxlevel):
+    # The lineage is passed down the recursion, thus no INI file is read more than once.
+    # Consumers may stop iterating early, so we must make sure the directory iterators
+    # are closed.
+    with scandir(dirpath) as entries:
+        for entry in entries:
+            if not (entry.is_dir() and _is_glottocode(entry.name)):
+                continue
+            cfg, core, text = _read_languoid_data(os.path.join(entry.path, INFO_FILENAME))
+            lang = Languoid(cfg, lineage, directory=Path(entry.path), core=core, text=text)
+            if lang.level > maxlevel:
+                # Levels are monotonically descending, so we can skip the whole subtree.
+                continue
+            if ids is None or lang.id in ids:
+                yield lang
+            for l in _walk_tree(
+                    entry.path, lineage + [(lang.name, lang.id, lang.level)], ids, maxlevel):
+                yield l
+
+
+def _ancestor_dirs(directory, tree=None):
+    """
+    Generator for the (path, Glottocode) pairs of the languoid directories above
+    `directory`, from the bottom up.
+
+    :param tree: Optional root directory of the languoid tree.
+    """
+    # We operate on path strings rather than on `Path.parents`, to keep the number of
+    # objects created in this hot loop low.
+    path = as_posix(directory)
+    if tree is not None:
+        root = as_posix(tree)
+        if path.startswith(root + '/'):
+            # All path components between the root of the tree and a languoid directory
+            # are Glottocodes, so there's no need to check.
+            ids = path[len(root) + 1:].split('/')[:-1]
+            for i in range(len(ids), 0, -1):
+                yield '/'.join([root] + ids[:i]), ids[i - 1]
+            return
+    head = os.path.dirname(path)
+    while True:
+        id_ = os.path.basename(head)
+        if not _is_glottocode(id_):
+            # we ignore leading non-languoid-dir path components.
+            break
+        yield head, id_
+        head = os.path.dirname(head)
+
+
+def _read_triple(directory, id_):
+    """
+    Read the (name, id, level) triple of the languoid in `directory` - without creating a
+    full `Languoid` object.
+    """
+    fname = os.path.join(directory, INFO_FILENAME)
+    cfg, core, text = _read_languoid_data(fname)
+    if core is not None and _MULTILINE not in (core.get('name'), core.get('level')):
+        name, level = core.get('name'), core.get('level')
+    else:
+        cfg = cfg or _parse_ini(text, fname)
+        name = cfg.get(Languoid.section_core, 'name', fallback=None)
+        level = cfg.get(Languoid.section_core, 'level', fallback=None)
+    return name, id_, Level.get(level) if level else None
+
 
 class Languoid(UnicodeMixin):
     """
@@ -23,41 +244,50 @@ class Languoid(UnicodeMixin):
     """
     section_core = 'core'
 
-    def __init__(self, cfg, lineage=None, id_=None, directory=None, tree=None):
+    def __init__(
+            self, cfg, lineage=None, id_=None, directory=None, tree=None, core=None, text=None):
         """
 
         :param cfg:
         :param lineage: list of ancestors, given as (id, name) pairs.
+        :param core: `dict` with the core section of the INI file as read by `_read_core`.
+        :param text: Content of the INI file. If given along with `core`, `cfg` may be \
+        `None` and will only be created from `text` when needed. Thus, a `Languoid` never \
+        reads from disk after it has been created.
         """
+        assert cfg is not None or (core is not None and text is not None)
         assert (id_ and tree) or directory
         if id_ is None:
             id_ = Glottocode(directory.name)
         lineage = lineage or []
-        assert all([
-            Glottocode.pattern.match(id) and
-            Level.get(level) for name, id, level in lineage])
         self.lineage = [(name, id, Level.get(level)) for name, id, level in lineage]
-        self.cfg = cfg
+        assert all(_is_glottocode(id) for _, id, _ in self.lineage)
+        self._cfg = cfg
+        self._core = core if cfg is None else None
+        self._text = text if cfg is None else None
         self.dir = directory or tree.joinpath(*[id for name, id, _ in self.lineage])
         self._id = id_
+        self._ancestors = None
+        # Values read from the core section of cfg, converted to the appropriate type. Thus,
+        # core values must be changed via the corresponding properties rather than in cfg.
+        self._core_values = {}
 
     @classmethod
-    def from_dir(cls, directory, nodes=None, **kw):
+    def from_dir(cls, directory, nodes=None, tree=None, **kw):
+        """
+        :param directory: `Path` of the languoid directory.
+        :param nodes: `dict` mapping Glottocodes to (name, id, level) triples of languoids.
+        :param tree: `Path` of the root of the languoid tree, if known.
+        """
         if nodes is None:
             nodes = {}
-        cfg = INI.from_file(directory.joinpath(INFO_FILENAME), interpolation=None)
+        cfg = _read_ini(directory.joinpath(INFO_FILENAME))
 
         lineage = []
-        for parent in directory.parents:
-            id_ = parent.name
+        for parent, id_ in _ancestor_dirs(directory, tree=tree):
             assert id_ != directory.name
-            if not Glottocode.pattern.match(id_):
-                # we ignore leading non-languoid-dir path components.
-                break
-
             if id_ not in nodes:
-                l = Languoid.from_dir(parent, nodes=nodes)
-                nodes[id_] = (l.name, l.id, l.level)
+                nodes[id_] = _read_triple(parent, id_)
             lineage.append(nodes[id_])
 
         res = cls(cfg, list(reversed(lineage)), directory=directory)
@@ -86,17 +316,39 @@ class Languoid(UnicodeMixin):
     def __unicode__(self):
         return '%s [%s]' % (self.name, self.id)
 
+    @property
+    def cfg(self):
+        """
+        The `INI` object holding the data of the languoid.
+
+        Note: Values in the core section are cached, so they must be changed via the
+        corresponding properties, e.g. `Languoid.name`, rather than directly in `cfg`.
+        """
+        if self._cfg is None:
+            self._cfg = _parse_ini(self._text, as_posix(self.fname))
+            self._core = self._text = None
+        return self._cfg
+
     def _set(self, key, value):
+        self._core_values.pop(key, None)
         if value is None and key in self.cfg[self.section_core]:
             del self.cfg[self.section_core][key]
         else:
             self.cfg.set(self.section_core, key, value)
 
     def _get(self, key, type_=None):
-        res = self.cfg.get(self.section_core, key, fallback=None)
-        if type_ and res:
-            return type_(res)
-        return res
+        # Looking up values in a ConfigParser is comparatively expensive, and attributes
+        # like name or level are accessed a lot, so we cache them.
+        try:
+            return self._core_values[key]
+        except KeyError:
+            res = _MULTILINE if self._core is None else self._core.get(key)
+            if res is _MULTILINE:
+                res = self.cfg.get(self.section_core, key, fallback=None)
+            if type_ and res:
+                res = type_(res)
+            self._core_values[key] = res
+            return res
 
     def newick_node(self, nodes=None):
         label = '{0} [{1}]'.format(
@@ -120,12 +372,11 @@ class Languoid(UnicodeMixin):
         if not outdir.exists():
             outdir.mkdir()
         fname = outdir.joinpath(INFO_FILENAME)
-        self.cfg.write(fname)
-        if os.linesep == '\n':
-            with fname.open(encoding='utf8') as fp:
-                text = fp.read()
-            with fname.open('w', encoding='utf8') as fp:
-                fp.write(text.replace('\n', '\r\n'))
+        # INI files in the tree use CRLF line endings on all platforms, so we let the file
+        # object translate newlines when writing.
+        with fname.open('w', encoding='utf8', newline='\r\n') as fp:
+            fp.write(self.cfg.write_string())
+        _FILE_CACHE.pop(as_posix(fname), None)
         return fname
 
     # -------------------------------------------------------------------------
@@ -170,11 +421,20 @@ class Languoid(UnicodeMixin):
     def children_from_nodemap(self, nodes):
         # A faster alternative to `children` when the relevant languoids have already been
         # read from disc.
-        return [nodes[d.name] for d in self.dir.iterdir() if d.is_dir()]
+        return [nodes[e.name] for e in scandir(as_posix(self.dir)) if e.is_dir()]
 
     @property
     def children(self):
-        return [Languoid.from_dir(d) for d in self.dir.iterdir() if d.is_dir()]
+        dirs = [e.path for e in scandir(as_posix(self.dir)) if e.is_dir()]
+        if self.dir.name != self.id:
+            return [Languoid.from_dir(Path(d)) for d in dirs]
+        # The lineage of the children is our lineage plus ourselves:
+        lineage = self.lineage + [(self.name, self.id, self.level)]
+        res = []
+        for d in dirs:
+            cfg, core, text = _read_languoid_data(os.path.join(d, INFO_FILENAME))
+            res.append(Languoid(cfg, lineage, directory=Path(d), core=core, text=text))
+        return res
 
     def ancestors_from_nodemap(self, nodes):
         # A faster alternative to `ancestors` when the relevant languoids have already
@@ -183,15 +443,18 @@ class Languoid(UnicodeMixin):
 
     @property
     def ancestors(self):
-        res = []
-        for parent in self.dir.parents:
-            id_ = parent.name
-            if Glottocode.pattern.match(id_):
-                res.append(Languoid.from_dir(parent))
+        if self._ancestors is None:
+            dirs = list(reversed(list(_ancestor_dirs(self.dir))))
+            if [id_ for _, id_ in dirs] == [id_ for _, id_, _ in self.lineage]:
+                # We already know the lineage of each ancestor, so no need to re-compute it.
+                self._ancestors = []
+                for i, (d, _) in enumerate(dirs):
+                    cfg, core, text = _read_languoid_data(os.path.join(d, INFO_FILENAME))
+                    self._ancestors.append(Languoid(
+                        cfg, self.lineage[:i], directory=Path(d), core=core, text=text))
             else:
-                # we ignore leading non-languoid-dir path components.
-                break
-        return list(reversed(res))
+                self._ancestors = [Languoid.from_dir(Path(d)) for d, _ in dirs]
+        return self._ancestors
 
     @property
     def parent(self):
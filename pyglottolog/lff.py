@@ -7,7 +7,7 @@ import logging
 
 from clldutils.path import as_posix, move, readlines
 
-from pyglottolog.languoids import Languoid
+from pyglottolog.languoids import Languoid, clear_caches
 from pyglottolog.objects import Level, Glottocode
 
 ISOLATE_ID = '-isolate-'
@@ -171,7 +171,15 @@ def lff2tree(api, log=logging.getLogger(__name__)):
         # move the old tree out of the way
         move(out, builddir)
     out.mkdir()
+    try:
+        with api.glottocodes.batch():
+            _lff2tree(api, log, out, old_tree)
+    finally:
+        # The tree on disk has changed, so whatever we read before is stale.
+        clear_caches()
 
+
+def _lff2tree(api, log, out, old_tree):
     new = {}
     languages = {}
     languoids = {}
@@ -219,27 +227,31 @@ def lff2tree(api, log=logging.getLogger(__name__)):
 
 
 def format_comp(l, gc=None):
-    res = '{0} [{1}]'.format(l.name, gc or l.id)
-    if l.iso:
-        res += ' {0}'.format(l.iso)
-    elif l.hid:
-        res += ' {0}'.format(l.hid)
+    # Note: This is called for each languoid and each of its ancestors in tree2lff, so we
+    # use %-formatting, which is quite a bit faster than str.format.
+    res = '%s [%s]' % (l.name, gc or l.id)
+    code = l.iso or l.hid
+    if code:
+        res += ' %s' % code
     return res
 
 
 def format_language(l):
-    return '    {0}'.format(format_comp(l))
+    return '    %s' % format_comp(l)
 
 
 def format_classification(l, agg):
     if not l.lineage:
         return format_comp(l, gc=ISOLATE_ID)
-    comps = []
-    for _, gc, _ in l.lineage:
-        a = agg[gc]
-        if l.level == Level.language or \
-                (l.level == Level.dialect and a.level != Level.family):
-            comps.append(format_comp(a))
+    level = l.level
+    if level == Level.language:
+        comps = [format_comp(agg[gc]) for _, gc, _ in l.lineage]
+    elif level == Level.dialect:
+        # The lineage already knows the level of each ancestor:
+        comps = [format_comp(agg[gc]) for _, gc, alevel in l.lineage
+                 if alevel != Level.family]
+    else:
+        comps = []
     return (LINEAGE_SEP + ' ').join(comps)
 
 
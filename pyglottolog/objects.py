@@ -1,6 +1,6 @@
 # coding: utf8
 from __future__ import unicode_literals, print_function, division
-from collections import OrderedDict
+import contextlib
 import re
 
 from six import text_type
@@ -10,6 +10,11 @@ import pycountry
 from clldutils.misc import slug, UnicodeMixin
 from clldutils import jsonlib
 from clldutils.declenum import DeclEnum
+from clldutils.path import as_posix
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from pyglottolog.util import message
 
@@ -17,10 +22,22 @@ from pyglottolog.util import message
 class Glottocodes(object):
     """
     Registry keeping track of glottocodes that have been dealt out.
+
+    New glottocodes are written back to the registry file right away - unless they are
+    dealt out within a `batch` block, in which case the file is written once, when the
+    block is left.
     """
     def __init__(self, fname):
         self._fname = fname
-        self._store = jsonlib.load(self._fname)
+        if orjson is None:
+            self._store = jsonlib.load(self._fname)
+        else:  # pragma: no cover
+            # Reading the registry is a lot faster with orjson, if available. For writing
+            # we stick to the json module, since orjson cannot reproduce the file's format.
+            with open(as_posix(self._fname), 'rb') as fp:
+                self._store = orjson.loads(fp.read())
+        self._batch_depth = 0
+        self._modified = False
 
     def __contains__(self, item):
         alpha, num = Glottocode(item).split()
@@ -31,6 +48,22 @@ class Glottocodes(object):
             for n in range(1234, num + 1):
                 yield '{0}{1}'.format(alpha, n)
 
+    @contextlib.contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.save()
+
+    def save(self):
+        if self._modified:
+            # Store the updated dictionary of glottocodes back.
+            jsonlib.dump(self._store, self._fname, indent=4, sort_keys=True)
+            self._modified = False
+
     def new(self, name, dry_run=False):
         alpha = slug(text_type(name))[:4]
         assert alpha
@@ -39,11 +72,9 @@ class Glottocodes(object):
         num = self._store.get(alpha, 1233) + 1
         if not dry_run:
             self._store[alpha] = num
-            # Store the updated dictionary of glottocodes back.
-            ordered = OrderedDict()
-            for k in sorted(self._store.keys()):
-                ordered[k] = self._store[k]
-            jsonlib.dump(ordered, self._fname, indent=4)
+            self._modified = True
+            if not self._batch_depth:
+                self.save()
         return Glottocode('%s%s' % (alpha, num))
 
 
@@ -1,7 +1,10 @@
 # coding: utf8
 from __future__ import unicode_literals, print_function, division
+import gc
+import warnings
 
 from clldutils.testing import capture
+from clldutils.path import move, rmtree
 
 from pyglottolog.tests.util import WithApi
 
@@ -12,6 +15,12 @@ class Tests(WithApi):
 
     def test_languoid(self):
         self.assertEqual(self.api.languoid('abc').name, 'language')
+        self.assertEqual(self.api.languoid('abcd1235').name, 'language')
+        self.assertIsNone(self.api.languoid('abcd9999'))
+        # The lookup index must notice changes to the tree:
+        move(self.api.tree.joinpath('abcd1234', 'abcd1235'),
+             self.api.tree.joinpath('abcd1235'))
+        self.assertEqual(self.api.languoid('abcd1235').dir.parent, self.api.tree)
 
     def test_languoids(self):
         from pyglottolog.languoids import Level
@@ -19,9 +28,22 @@ class Tests(WithApi):
         self.assertEqual(len(list(self.api.languoids())), 4)
         self.assertEqual(len(list(self.api.languoids(maxlevel=Level.family))), 1)
         self.assertEqual(len(list(self.api.languoids(maxlevel=Level.language))), 3)
+        self.assertEqual(
+            [l.lineage[-1][1] for l in self.api.languoids(ids=['abcd1235'])], ['abcd1234'])
         self.assertEqual(len(self.api.languoids_by_code()), 7)
         self.assertIn('NOCODE_Family-name', self.api.languoids_by_code())
 
+        # Stopping a walk early must not leave directory iterators open:
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            next(self.api.languoids())
+            gc.collect()
+        self.assertFalse([x for x in w if x.category.__name__ == 'ResourceWarning'])
+
+        # A missing tree is treated like an empty one:
+        rmtree(self.api.tree)
+        self.assertEqual(list(self.api.languoids()), [])
+
     def test_load_triggers(self):
         self.assertEqual(len(self.api.triggers), 2)
 
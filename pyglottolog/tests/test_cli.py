@@ -1,5 +1,6 @@
 # coding: utf8
 from __future__ import unicode_literals, print_function, division
+import os
 
 from six import text_type, PY2
 from mock import Mock, patch
@@ -85,6 +86,12 @@ class Tests(WithApi):
         self.assertEqual(
             len(list(self.repos.joinpath('languoids').glob('*.md'))), 7)
 
+        # Unchanged index files are not re-written:
+        mdfile = self.repos.joinpath('languoids', 'languages.md')
+        os.utime(mdfile.as_posix(), (0, 0))
+        index(self._args())
+        self.assertEqual(mdfile.stat().st_mtime, 0)
+
     def test_tree(self):
         from pyglottolog.commands import tree, ParserError
 
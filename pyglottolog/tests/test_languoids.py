@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 from unittest import TestCase
 
+from mock import patch
 from clldutils.testing import WithTempDir
 from clldutils import jsonlib
 
@@ -25,6 +26,18 @@ class TestGlottocodes(WithTempDir):
         self.assertIn(gc, Glottocodes(gcjson))
         self.assertEqual(len(list(Glottocodes(gcjson))), 1)
 
+        with glottocodes.batch():
+            gc = glottocodes.new('a')
+            self.assertNotIn(gc, Glottocodes(gcjson))
+        self.assertIn(gc, Glottocodes(gcjson))
+
+    def test_Glottocodes_load(self):
+        gcjson = self.tmp_path('glottocodes.json')
+        jsonlib.dump({'abcd': 1234}, gcjson)
+        self.assertIn('abcd1234', Glottocodes(gcjson))
+        with patch('pyglottolog.objects.orjson', None):
+            self.assertIn('abcd1234', Glottocodes(gcjson))
+
 
 class Tests(TestCase):
     def test_es(self):
@@ -70,6 +83,8 @@ class TestLanguoid(WithApi):
         f = Languoid.from_dir(self.api.tree.joinpath('abcd1234'))
         self.assertEqual(f.category, 'Family')
         l = Languoid.from_dir(self.api.tree.joinpath(f.id, 'abcd1235'))
+        self.assertEqual(
+            Languoid.from_dir(l.dir, tree=self.api.tree).lineage, l.lineage)
         self.assertEqual(l.name, 'language')
         self.assertIn('abcd1235', repr(l))
         self.assertIn('language', '%s' % l)
@@ -95,10 +110,15 @@ class TestLanguoid(WithApi):
         self.assertEqual(len(l.countries), 2)
 
         self.assertEqual(l.parent, f)
+        self.assertIs(l.parent, l.ancestors[-1])
+        self.assertEqual(l.children[0].ancestors[-1].lineage, l.lineage)
         self.assertEqual(f.children[0], l)
         self.assertEqual(l.children[0].family, f)
         l.write_info(self.tmp_path().as_posix())
         self.assertTrue(self.tmp_path('abcd1235').exists())
+        with self.tmp_path('abcd1235', 'md.ini').open('rb') as fp:
+            content = fp.read()
+        self.assertEqual(content.count(b'\n'), content.count(b'\r\n'))
         self.assertIsInstance(
             self.api.languoid('abcd1235').iso_retirement.asdict(), dict)
         self.assertIsNone(l.classification_comment)
@@ -111,6 +131,53 @@ class TestLanguoid(WithApi):
         l.cfg['identifier'] = {'multitree': 'xyz'}
         self.assertIn('multitree', l.identifier)
 
+    def test_caches(self):
+        from pyglottolog.languoids import clear_caches
+
+        d = self.api.tree.joinpath('abcd1234')
+        clear_caches()
+        self.assertEqual(Languoid.from_dir(d).name, Languoid.from_dir(d).name)
+
+        # Changes to one languoid object must not leak into others:
+        l = self.api.languoid('abcd1235')
+        l.name = 'changed'
+        del l.cfg['sources']
+        l = self.api.languoid('abcd1235')
+        self.assertEqual(l.name, 'language')
+        self.assertIn('sources', l.cfg)
+
+        # Changes written to disk must be visible for others:
+        f = Languoid.from_dir(d)
+        f.name = 'renamed'
+        f.write_info()
+        l = self.api.languoid('abcd1235')
+        self.assertEqual(l.lineage[-1][0], 'renamed')
+        self.assertEqual(l.parent.name, 'renamed')
+
+    def test_read_core(self):
+        from pyglottolog.languoids import _read_core, _read_ini, _MULTILINE
+
+        core = _read_core(
+            '# comment\n[core]\nname = a: b\nLevel=language\nlinks =\n\tx\n\ty\n'
+            '[sources]\nname = x\n')
+        self.assertEqual(core['name'], 'a: b')
+        self.assertEqual(core['level'], 'language')
+        self.assertIs(core['links'], _MULTILINE)
+        self.assertIsNone(_read_core('[core]\nname = a\nname = b\n'))
+        self.assertIsNone(_read_core('[core]\nname = a\n[sources]\n[core]\nlevel = b\n'))
+        self.assertIsNone(_read_core('[core]\nname = a\n[core]\nlevel = b\n'))
+
+        for l in self.api.languoids():
+            cfg = _read_ini(l.fname)
+            for key in ['name', 'hid', 'iso639-3', 'macroareas']:
+                self.assertEqual(
+                    l._get(key), cfg.get(Languoid.section_core, key, fallback=None))
+
+        # Languoids read from the tree do not access the file again:
+        l = list(self.api.languoids(ids=['isol1234']))[0]
+        l.fname.unlink()
+        self.assertEqual(l.cfg.get('core', 'name'), l.name)
+
     def test_isolate(self):
         l = Languoid.from_dir(self.api.tree.joinpath('isol1234'))
         self.assertTrue(l.isolate)
@@ -28,6 +28,17 @@ class TestsWithFiles(WithApi):
             fp.write(content)
         return content
 
+    def test_lff2tree_without_tree(self):
+        rmtree(self.api.tree)
+        self._set_lff("""# -*- coding: utf-8 -*-
+Abkhaz-Adyge [abkh1242]
+    Ubykh [ubyk1235]uby
+""", 'lff.txt')
+        self._set_lff("""# -*- coding: utf-8 -*-
+""", 'dff.txt')
+        lff2tree(self.api)
+        self.assertEqual(self.api.languoid('ubyk1235').lineage[0][1], 'abkh1242')
+
     def test_lff2tree(self):
         lfftext = self._set_lff("""# -*- coding: utf-8 -*-
 Abkhaz-Adyge [abkh1242] aaa
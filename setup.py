@@ -16,6 +16,7 @@ requires = [
     'markdown',
     'bs4',
     'requests',
+    'scandir; python_version < "3.6"',
 ]
 
 setup(